@@ -1,4 +1,6 @@
 import os
+import re
+import shutil
 import fnmatch
 
 # --- SCRIPT CONFIGURATION ---
@@ -42,17 +44,22 @@ EXCLUDED_FILES = [
 ]
 # --- END OF CONFIGURATION ---
 
+# Each exclusion list compiled once into a single regex, instead of letting
+# fnmatch translate and match every pattern for every path.
+_EXCLUDED_DIRECTORIES_RE = re.compile("|".join(fnmatch.translate(p) for p in EXCLUDED_DIRECTORIES))
+_EXCLUDED_FILES_RE = re.compile("|".join(fnmatch.translate(p) for p in EXCLUDED_FILES))
+
+SEPARATOR_LINE = b"=" * 80 + b"\n"
+
 
 def should_exclude(path, is_dir):
-    """Check if a file or directory should be excluded based on the lists."""
+    """
+    Check if a file or directory should be excluded based on the lists.
+    Only the base name is matched, so callers may pass a bare entry name.
+    """
     base_name = os.path.basename(path)
-    
-    exclusion_list = EXCLUDED_DIRECTORIES if is_dir else EXCLUDED_FILES
-    
-    for pattern in exclusion_list:
-        if fnmatch.fnmatch(base_name, pattern):
-            return True
-    return False
+    exclusion_re = _EXCLUDED_DIRECTORIES_RE if is_dir else _EXCLUDED_FILES_RE
+    return exclusion_re.match(base_name) is not None
 
 
 def create_codebase_file():
@@ -68,18 +75,19 @@ def create_codebase_file():
     file_count = 0
 
     try:
-        # Open the output file with UTF-8 encoding
-        with open(OUTPUT_FILENAME, 'w', encoding='utf-8', errors='ignore') as outfile:
+        # Open the output file in binary mode so file contents can be
+        # streamed straight through without a decode/encode round-trip
+        with open(OUTPUT_FILENAME, 'wb') as outfile:
             
-            for dirpath, dirnames, filenames in os.walk(ROOT_DIRECTORY, topdown=True):
+            for dirpath, dirnames, filenames in os.walk(ROOT_DIRECTORY, topdown=True, followlinks=False):
                 # --- Directory Exclusion ---
                 # Modify dirnames in-place to prevent os.walk from descending
                 # into the excluded directories.
-                dirnames[:] = [d for d in dirnames if not should_exclude(os.path.join(dirpath, d), is_dir=True)]
+                dirnames[:] = [d for d in dirnames if not should_exclude(d, is_dir=True)]
                 
                 for filename in filenames:
                     # --- File Exclusion ---
-                    if should_exclude(os.path.join(dirpath, filename), is_dir=False):
+                    if should_exclude(filename, is_dir=False):
                         continue
 
                     file_path = os.path.join(dirpath, filename)
@@ -87,15 +95,15 @@ def create_codebase_file():
                     try:
                         # Write a clear header for each file
                         header = f"--- File: {os.path.relpath(file_path, ROOT_DIRECTORY)} ---"
-                        outfile.write("=" * 80 + "\n")
-                        outfile.write(header + "\n")
-                        outfile.write("=" * 80 + "\n\n")
+                        outfile.write(SEPARATOR_LINE)
+                        outfile.write(header.encode('utf-8') + b"\n")
+                        outfile.write(SEPARATOR_LINE + b"\n")
                         
-                        # Read and write the file content
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as infile:
-                            outfile.write(infile.read())
+                        # Stream the file content in 1 MiB chunks
+                        with open(file_path, 'rb') as infile:
+                            shutil.copyfileobj(infile, outfile, length=1 << 20)
                         
-                        outfile.write("\n\n")
+                        outfile.write(b"\n\n")
                         file_count += 1
 
                     except Exception as e:
@@ -1,11 +1,12 @@
 # graphiti_ingestion/api/dashboard.py
 
-import json
 import logging
 from pathlib import Path
+from typing import Any, Dict, List
 
+import orjson
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 
 from ..services.job_manager import JobManager, get_job_manager
 from .dashboard_websockets import websocket_manager
@@ -22,6 +23,12 @@ router = APIRouter(
 # This assumes your 'static' folder is at the same level as 'main.py'
 STATIC_DIR = Path(__file__).parent.parent.parent / "static"
 INDEX_HTML_PATH = STATIC_DIR / "index.html"
+# Resolved once at import; the static bundle ships with the code and does not
+# appear or disappear while the service is running.
+INDEX_HTML_EXISTS = INDEX_HTML_PATH.is_file()
+
+# Number of job statuses per `all_jobs_chunk` frame sent to the dashboard.
+ALL_JOBS_CHUNK_SIZE = 256
 
 
 @router.get(
@@ -34,12 +41,35 @@ async def get_dashboard_page():
     Endpoint to serve the `index.html` file for the dashboard.
     FastAPI's FileResponse handles sending the file to the client's browser.
     """
-    if not INDEX_HTML_PATH.is_file():
+    if not INDEX_HTML_EXISTS:
         logger.error(f"Dashboard HTML file not found at: {INDEX_HTML_PATH}")
-        return {"error": "Dashboard UI not found"}, 500
+        return JSONResponse(status_code=500, content={"error": "Dashboard UI not found"})
     return FileResponse(INDEX_HTML_PATH)
 
 
+async def _send_all_jobs(websocket: WebSocket, job_manager: JobManager) -> None:
+    """
+    Streams every job status to one client as `all_jobs_chunk` frames.
+
+    Each frame carries `seq` and `done`, so the browser can start merging
+    jobs before the scan finishes. The last frame (possibly with an empty
+    payload when there are no jobs) has `done: true`. One chunk is held back
+    so the final frame can be flagged.
+    """
+    seq = 0
+    pending: List[Dict[str, Any]] = []
+    async for chunk in job_manager.iter_job_statuses(chunk_size=ALL_JOBS_CHUNK_SIZE):
+        if pending:
+            await websocket.send_bytes(orjson.dumps(
+                {"type": "all_jobs_chunk", "seq": seq, "done": False, "payload": pending}
+            ))
+            seq += 1
+        pending = chunk
+    await websocket.send_bytes(orjson.dumps(
+        {"type": "all_jobs_chunk", "seq": seq, "done": True, "payload": pending}
+    ))
+
+
 @router.websocket("/ws/dashboard")
 async def websocket_endpoint(
     websocket: WebSocket,
@@ -56,24 +86,24 @@ async def websocket_endpoint(
     await websocket_manager.connect(websocket)
     try:
         while True:
-            # Wait for a message from the client
-            raw_data = await websocket.receive_text()
+            # Wait for a message from the client. The browser sends text
+            # frames, but binary frames are accepted too; orjson parses both
+            # without an intermediate str decode.
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            raw_data = message.get("bytes") or message.get("text") or b""
             try:
-                data = json.loads(raw_data)
+                data = orjson.loads(raw_data)
                 action = data.get("action")
 
                 # Handle the initial request to load all job data
                 if action == "get_all_jobs":
                     logger.info("Dashboard requested all job statuses.")
-                    all_jobs = await job_manager.get_all_job_statuses()
-                    # Send the job list back to the client
-                    await websocket.send_json({
-                        "type": "all_jobs",
-                        "payload": all_jobs
-                    })
-
-            except json.JSONDecodeError:
-                logger.warning(f"Received invalid JSON via WebSocket: {raw_data}")
+                    await _send_all_jobs(websocket, job_manager)
+
+            except orjson.JSONDecodeError:
+                logger.warning(f"Received invalid JSON via WebSocket: {raw_data!r}")
             except Exception as e:
                 logger.error(f"Error processing WebSocket message: {e}", exc_info=True)
 
@@ -2,12 +2,26 @@
 
 import asyncio
 import logging
-from typing import List
-import json
+import time
+from collections import deque
+from typing import Deque, Optional, Set
+
+import orjson
 from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
 
+# A send that cannot complete within this window means the client is not
+# draining its socket; it is dropped instead of stalling every broadcast.
+# Generous enough to ride out GC pauses and large log frames.
+SEND_TIMEOUT_SECONDS = 1.0
+# WebSocket close code sent to evicted clients so the dashboard reconnects.
+EVICTED_CLOSE_CODE = 1011
+# Log lines waiting to be broadcast; the oldest are dropped during a flood.
+LOG_BUFFER_SIZE = 2048
+# Most log lines packed into a single `logs` frame.
+MAX_LOG_LINES_PER_FRAME = 256
+
 
 class WebSocketManager:
     """
@@ -17,34 +31,110 @@ class WebSocketManager:
     broadcast messages to them, such as live log updates or job status changes.
     """
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        self.loop = asyncio.get_event_loop()
+        self.active_connections: Set[WebSocket] = set()
+        # Captured from the server's running loop on the first `connect`; the
+        # singleton is built at import time, before uvicorn's loop exists.
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # Log lines are buffered here and fanned out in batches by a single
+        # drain task, instead of one broadcast per record.
+        self._log_buffer: Deque[str] = deque(maxlen=LOG_BUFFER_SIZE)
+        self._log_event: Optional[asyncio.Event] = None
+        self._drain_task: Optional[asyncio.Task] = None
+        # Background closes of evicted sockets, held so they are not GC'd.
+        self._closing: Set[asyncio.Task] = set()
 
     async def connect(self, websocket: WebSocket):
         """Accepts and stores a new WebSocket connection."""
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+            self._log_event = asyncio.Event()
+            self._drain_task = asyncio.create_task(self._drain_logs())
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
         logger.info("Dashboard client connected via WebSocket.")
 
     def disconnect(self, websocket: WebSocket):
         """Removes a WebSocket connection."""
-        self.active_connections.remove(websocket)
+        # discard: the socket may already have been evicted by `broadcast`
+        self.active_connections.discard(websocket)
         logger.info("Dashboard client disconnected.")
 
-    async def broadcast(self, message: str):
-        """Sends a message to all connected clients."""
+    async def broadcast(self, message: bytes):
+        """
+        Sends a message to all connected clients.
+
+        The message is pre-encoded JSON (see `orjson.dumps`), so it is encoded
+        once and the same bytes are sent to every client as a binary frame.
+        Clients whose send fails or exceeds `SEND_TIMEOUT_SECONDS` are evicted
+        so dead or backed-up sockets are not retried on every message.
+        """
+        # Snapshot: connect/disconnect may mutate the set while we await
+        connections = tuple(self.active_connections)
         # Create a list of tasks to send messages concurrently
-        tasks = [connection.send_text(message) for connection in self.active_connections]
-        # Wait for all messages to be sent, but don't fail if one client has an issue
-        await asyncio.gather(*tasks, return_exceptions=True)
+        tasks = [
+            asyncio.wait_for(connection.send_bytes(message), timeout=SEND_TIMEOUT_SECONDS)
+            for connection in connections
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for connection, result in zip(connections, results):
+            if isinstance(result, BaseException):
+                self._evict(connection)
+                # Log at debug level: this handler also streams the log itself
+                logger.debug(f"Dropped dashboard client after failed send: {result!r}")
+
+    def _evict(self, websocket: WebSocket) -> None:
+        """
+        Stops broadcasting to a client and closes its socket in the background,
+        so the browser sees `onclose` and reconnects instead of going stale.
+        """
+        if websocket not in self.active_connections:
+            return
+        self.active_connections.discard(websocket)
+        task = asyncio.create_task(self._close_evicted(websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_evicted(websocket: WebSocket) -> None:
+        """Closes an evicted socket, ignoring errors from an already-dead one."""
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=EVICTED_CLOSE_CODE), timeout=SEND_TIMEOUT_SECONDS
+            )
+        except Exception as e:
+            logger.debug(f"Closing evicted dashboard client failed: {e!r}")
 
-    def broadcast_threadsafe(self, message: str):
+    def broadcast_threadsafe(self, message: bytes):
         """
         Sends a message from a non-async context (like a standard logging thread)
         by scheduling the broadcast on the main event loop.
         """
+        if self.loop is None:
+            return  # No client has connected yet, so there is no one to notify
         asyncio.run_coroutine_threadsafe(self.broadcast(message), self.loop)
 
+    def queue_log_threadsafe(self, line: str) -> None:
+        """
+        Buffers a formatted log line for the drain task. Safe to call from
+        any thread; `deque.append` is atomic and the wakeup is scheduled on
+        the manager's loop.
+        """
+        if self.loop is None:
+            return  # No client has connected yet, so there is no one to notify
+        self._log_buffer.append(line)
+        self.loop.call_soon_threadsafe(self._log_event.set)
+
+    async def _drain_logs(self) -> None:
+        """Batches buffered log lines into `logs` frames and broadcasts them."""
+        while True:
+            await self._log_event.wait()
+            self._log_event.clear()
+            while self._log_buffer:
+                count = min(len(self._log_buffer), MAX_LOG_LINES_PER_FRAME)
+                batch = [self._log_buffer.popleft() for _ in range(count)]
+                if self.active_connections:
+                    await self.broadcast(orjson.dumps({"type": "logs", "payload": batch}))
+
 
 # --- Create a singleton instance to be used across the application ---
 websocket_manager = WebSocketManager()
@@ -59,27 +149,54 @@ class WebSocketLogHandler(logging.Handler):
     formats the log record and uses the WebSocketManager to broadcast it to all
     connected dashboard clients in real-time.
     """
+    # Matches the layout of the old `logging.Formatter` so the dashboard's
+    # level highlighting keeps working.
+    DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+    _exception_formatter = logging.Formatter()
+
     def __init__(self, manager: WebSocketManager):
         super().__init__()
         self.manager = manager
-        # Set a professional log format for the dashboard stream
-        formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)-8s - %(name)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        self.setFormatter(formatter)
+        # Second-resolution timestamp cache; only re-rendered when the second
+        # changes. `Handler.handle` holds the handler lock around `emit`.
+        self._cached_second: int = -1
+        self._cached_timestamp: str = ""
+
+    def _format_time(self, created: float) -> str:
+        """Returns the record time as DATE_FORMAT, formatting at most once per second."""
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_timestamp = time.strftime(self.DATE_FORMAT, time.localtime(second))
+            self._cached_second = second
+        return self._cached_timestamp
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Builds the log line straight from the record's attributes.
+
+        This replaces a `logging.Formatter` ('%(asctime)s - %(levelname)-8s -
+        %(name)s - %(message)s'), skipping its %-style template rendering on
+        every record.
+        """
+        timestamp = self._format_time(record.created)
+        msg = f"{timestamp} - {record.levelname:<8} - {record.name} - {record.getMessage()}"
+        if record.exc_info:
+            # Cache the traceback text on the record like logging.Formatter does
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(record.exc_info)
+        if record.exc_text:
+            msg = f"{msg}\n{record.exc_text}"
+        return msg
 
     def emit(self, record: logging.LogRecord):
         """
-        Formats the log record and broadcasts it thread-safely.
+        Formats the log record and queues it for a batched broadcast.
         """
         try:
             # Format the log record into a string
             msg = self.format(record)
-            # Create a JSON structure for the frontend to easily parse
-            log_data = {"type": "log", "payload": msg}
-            # Use the thread-safe method to broadcast from the logging thread
-            self.manager.broadcast_threadsafe(json.dumps(log_data))
+            # Hand the line to the manager's batching buffer (thread-safe)
+            self.manager.queue_log_threadsafe(msg)
         except Exception:
             # If broadcasting fails, fall back to handling the error locally
-            self.handleError(record)
\ No newline at end of file
+            self.handleError(record)
@@ -1,7 +1,11 @@
 # graphiti_ingestion/api/episodes.py
 
-import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import os
+import re
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from ..models.episodes import (
     EpisodeRequest,
@@ -19,6 +23,13 @@ router = APIRouter(
     },
 )
 
+# Upper bound on episodes per bulk submission, to keep a single request's
+# disk writes and response size bounded.
+MAX_BULK_EPISODES = 256
+# Job IDs are hex (`os.urandom(16).hex()`); older ones are hyphenated UUIDs.
+# Anything else, notably path separators, never names a real job.
+_JOB_ID_RE = re.compile(r"[0-9a-fA-F-]{1,64}")
+
 
 @router.post(
     "/",
@@ -50,7 +61,7 @@ async def submit_episode(
     Returns:
         An EpisodeResponse containing the generated job_id and initial status.
     """
-    job_id = str(uuid.uuid4())
+    job_id = os.urandom(16).hex()
     await job_manager.submit_job(job_id, episode_request.model_dump())
 
     return EpisodeResponse(
@@ -60,6 +71,100 @@ async def submit_episode(
     )
 
 
+@router.post(
+    "/bulk",
+    response_model=List[EpisodeResponse],
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit several episodes for ingestion in one request",
+    description=(
+        "Accepts a JSON array of episodes and queues each one as its own job. "
+        "Returns one job ID per episode, in the same order as the request."
+    ),
+)
+async def submit_episodes_bulk(
+    episode_requests: List[EpisodeRequest],
+    job_manager: JobManager = Depends(get_job_manager),
+) -> List[EpisodeResponse]:
+    """
+    Submits a batch of episodes to the persistent ingestion queue.
+
+    This saves bulk clients one HTTP round-trip per episode. Each episode is
+    still persisted as an independent job, so the worker and the dashboard
+    treat them exactly like single submissions.
+
+    Args:
+        episode_requests: The list of episodes to ingest.
+        job_manager: The dependency-injected job manager service.
+
+    Returns:
+        One EpisodeResponse per submitted episode, in request order.
+
+    Raises:
+        HTTPException (422 Unprocessable Entity): If the batch is empty or
+            larger than MAX_BULK_EPISODES.
+    """
+    if not episode_requests or len(episode_requests) > MAX_BULK_EPISODES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"A bulk submission must contain between 1 and {MAX_BULK_EPISODES} episodes.",
+        )
+
+    job_ids = [os.urandom(16).hex() for _ in episode_requests]
+    await asyncio.gather(*(
+        job_manager.submit_job(job_id, episode_request.model_dump())
+        for job_id, episode_request in zip(job_ids, episode_requests)
+    ))
+
+    return [
+        EpisodeResponse(
+            job_id=job_id,
+            status="pending",
+            message="Episode accepted for processing and saved to disk.",
+        )
+        for job_id in job_ids
+    ]
+
+
+@router.get(
+    "/status",
+    response_model=List[JobStatusResponse],
+    summary="Check the status of several ingestion jobs",
+    description=f"Retrieves the current status of multiple jobs in one request (at most {MAX_BULK_EPISODES} IDs). Unknown job IDs are omitted from the result.",
+)
+async def get_job_statuses(
+    ids: str = Query(..., description="Comma-separated list of job IDs."),
+    job_manager: JobManager = Depends(get_job_manager),
+) -> List[JobStatusResponse]:
+    """
+    Retrieves the statuses of several ingestion jobs by their IDs.
+
+    Args:
+        ids: Comma-separated job IDs, as returned by the submission endpoints.
+        job_manager: The dependency-injected job manager service.
+
+    Returns:
+        The status of every job that was found, in request order.
+
+    Raises:
+        HTTPException (422 Unprocessable Entity): If more than
+            MAX_BULK_EPISODES job IDs are requested, or an ID is malformed.
+    """
+    job_ids = [job_id for job_id in (part.strip() for part in ids.split(",")) if job_id]
+    if len(job_ids) > MAX_BULK_EPISODES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"A status lookup may request at most {MAX_BULK_EPISODES} job IDs.",
+        )
+    invalid = [job_id for job_id in job_ids if not _JOB_ID_RE.fullmatch(job_id)]
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Malformed job IDs: {', '.join(invalid[:5])}",
+        )
+    statuses = await asyncio.gather(*(job_manager.get_job_status(job_id) for job_id in job_ids))
+    return [JobStatusResponse(**info) for info in statuses if info is not None]
+
+
 @router.get(
     "/status/{job_id}",
     response_model=JobStatusResponse,
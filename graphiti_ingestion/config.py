@@ -34,13 +34,15 @@ class Settings(BaseSettings):
     GEMINI_DEFAULT_RERANKER: str = "gemini-2.5-flash-lite"
     GEMINI_GLOBAL_COOLDOWN_SECONDS: float = 5.0
     GEMINI_API_KEY_COOLDOWN_SECONDS: float = 60.0
+    GEMINI_WORKER_CONCURRENCY: int = 0  # 0 = one worker task per API key
     POST_SUCCESS_DELAY_SECONDS: float = 60.0
 
     # Pydantic-settings configuration
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
-        extra="ignore"  # Ignore extra fields in the environment
+        extra="ignore",  # Ignore extra fields in the environment
+        frozen=True,  # Settings are read-only once loaded
     )
 
 
@@ -1,18 +1,98 @@
 # graphiti_ingestion/core/jina_triton_embedder.py
 
 import asyncio
-import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import aiohttp
 import numpy as np
+import orjson
 from graphiti_core.embedder.client import EmbedderClient, EmbedderConfig
 from pydantic import Field
+from tokenizers import Tokenizer
 from transformers import AutoTokenizer
 
 logger = logging.getLogger(__name__)
 
+# Header Triton uses to split the JSON part of a request/response from the
+# raw tensor bytes that follow it (binary tensor data extension).
+INFERENCE_HEADER_LENGTH = "Inference-Header-Content-Length"
+
+# Longest token sequence the Jina V3 models accept; longer inputs are truncated.
+MAX_SEQUENCE_LENGTH = 8192
+# Batches are padded up to a power-of-two length no shorter than this, so
+# Triton sees a handful of shapes instead of one per batch.
+MIN_BUCKET_LENGTH = 64
+
+# Triton output datatypes we know how to view as NumPy arrays.
+_TRITON_DTYPES = {"FP32": np.float32, "FP16": np.float16, "FP64": np.float64}
+
+
+@lru_cache(maxsize=4)
+def _load_tokenizer(tokenizer_name: str) -> Any:
+    """
+    Loads a Hugging Face fast tokenizer once per process.
+
+    Every embedder instance for the same tokenizer shares the result. Loading
+    it before forking worker processes lets them share it copy-on-write.
+    """
+    return AutoTokenizer.from_pretrained(tokenizer_name, trust_remote_code=True, use_fast=True)
+
+
+def _bucket_length(length: int) -> int:
+    """Rounds a sequence length up to its power-of-two bucket in [64, 8192]."""
+    return min(MAX_SEQUENCE_LENGTH, max(MIN_BUCKET_LENGTH, 1 << (length - 1).bit_length()))
+
+
+@lru_cache(maxsize=256)
+def _binary_request_header(batch: int, seq_len: int, output_name: str) -> bytes:
+    """
+    Returns the JSON header of a binary-tensor Triton request for a
+    [batch, seq_len] INT64 `input_ids`/`attention_mask` pair.
+
+    The header depends only on the shape, so it is serialized once per shape.
+    """
+    tensor_bytes = batch * seq_len * np.dtype(np.int64).itemsize
+    return orjson.dumps({
+        "inputs": [
+            {
+                "name": "input_ids",
+                "shape": [batch, seq_len],
+                "datatype": "INT64",
+                "parameters": {"binary_data_size": tensor_bytes},
+            },
+            {
+                "name": "attention_mask",
+                "shape": [batch, seq_len],
+                "datatype": "INT64",
+                "parameters": {"binary_data_size": tensor_bytes},
+            },
+        ],
+        "outputs": [
+            {"name": output_name, "parameters": {"binary_data": True}}
+        ],
+    })
+
+
+def _mean_pool_and_normalize(hidden_state: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """
+    Mean-pools a [B, S, H] hidden state over its unmasked tokens and
+    L2-normalizes the result, returning a [B, H] float32 array.
+
+    The masked sum is a single `einsum`, so no [B, S, H] temporary is
+    allocated. Dividing by the token count is skipped: it is a positive
+    per-row scale, which the L2 normalization cancels out. The squared norms
+    are one more `einsum` over [B, H], and the result is scaled in place.
+    """
+    mask = attention_mask.astype(np.float32, copy=False)
+    pooled = np.einsum("bsh,bs->bh", hidden_state, mask)
+    inv_norms = np.einsum("bh,bh->b", pooled, pooled)
+    np.sqrt(inv_norms, out=inv_norms)
+    np.reciprocal(inv_norms, out=inv_norms)
+    pooled *= inv_norms[:, None]
+    return pooled
+
 
 class JinaV3TritonEmbedderConfig(EmbedderConfig):
     """Configuration for the JinaV3TritonEmbedder."""
@@ -23,6 +103,10 @@ class JinaV3TritonEmbedderConfig(EmbedderConfig):
     triton_request_timeout: int = Field(
         default=60, description="Request timeout in seconds for connecting to Triton."
     )
+    triton_keepalive_timeout: float = Field(
+        default=60.0,
+        description="Seconds an idle keep-alive connection to Triton is kept open for reuse.",
+    )
     query_model_name: str = Field(
         default="jina_query", description="Name of the query embedding model in Triton."
     )
@@ -36,12 +120,30 @@ class JinaV3TritonEmbedderConfig(EmbedderConfig):
     )
     triton_output_name: str = Field(
         default="text_embeds",
-        description="The name of the output tensor from the Triton model.",
+        description=(
+            "The name of the output tensor from the Triton model. Either the "
+            "[B, S, H] hidden state, pooled on the client, or an already "
+            "pooled and L2-normalized [B, H] embedding."
+        ),
     )
     batch_size: int = Field(
         default=4,
         description="Number of texts to process in a single batch request to Triton.",
     )
+    max_in_flight: int = Field(
+        default=8,
+        description=(
+            "Maximum number of batch requests sent to Triton concurrently. "
+            "Triton's dynamic batcher can merge them on the GPU."
+        ),
+    )
+    binary_tensors: bool = Field(
+        default=True,
+        description=(
+            "Send and receive tensors as raw bytes using Triton's binary data "
+            "extension. Set to False to fall back to JSON-encoded tensors."
+        ),
+    )
 
 
 class JinaV3TritonEmbedder(EmbedderClient):
@@ -57,88 +159,181 @@ class JinaV3TritonEmbedder(EmbedderClient):
         super().__init__()
         self.config = config
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                self.config.tokenizer_name, trust_remote_code=True
-            )
+            self.tokenizer = _load_tokenizer(self.config.tokenizer_name)
         except Exception as e:
             logger.critical(f"Failed to load Hugging Face tokenizer '{self.config.tokenizer_name}'. Error: {e}")
             raise
+        # Standalone copy of the Rust tokenizer with truncation baked in. It
+        # is a copy so the `transformers` wrapper's per-call settings never
+        # leak into it (or vice versa). Padding is done by `_tokenize`, which
+        # writes straight into the bucket-sized tensors.
+        self._rust_tokenizer = Tokenizer.from_str(self.tokenizer.backend_tokenizer.to_str())
+        self._rust_tokenizer.no_padding()
+        self._rust_tokenizer.enable_truncation(max_length=MAX_SEQUENCE_LENGTH)
+        self._pad_id = self.tokenizer.pad_token_id
+        self._encode_batch = getattr(
+            self._rust_tokenizer, "encode_batch_fast", self._rust_tokenizer.encode_batch
+        )
 
         self._client_session = client_session
         self._owns_session = client_session is None
+        self._in_flight = asyncio.Semaphore(max(1, self.config.max_in_flight))
+        # The requested-outputs section of a JSON request never changes, and
+        # it is only ever serialized, never mutated, so one copy is shared.
+        self._json_outputs = [{"name": self.config.triton_output_name}]
         logger.info(f"JinaV3TritonEmbedder configured for Triton at {self.config.triton_url}")
 
     @property
     async def client_session(self) -> aiohttp.ClientSession:
         if self._client_session is None:
-            self._client_session = aiohttp.ClientSession()
+            # Keep enough warm connections for every in-flight batch and reuse
+            # them between batches instead of reconnecting to Triton.
+            connector = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=max(1, self.config.max_in_flight),
+                keepalive_timeout=self.config.triton_keepalive_timeout,
+                ttl_dns_cache=300,
+            )
+            self._client_session = aiohttp.ClientSession(connector=connector)
         return self._client_session
 
     def _build_triton_payload(
         self, input_ids: np.ndarray, attention_mask: np.ndarray
     ) -> Dict[str, Any]:
-        """Constructs the JSON payload for Triton."""
+        """
+        Constructs the JSON payload for Triton. The tensors are passed as flat
+        NumPy views, which `orjson.OPT_SERIALIZE_NUMPY` encodes without
+        building Python lists.
+        """
         return {
             "inputs": [
                 {
                     "name": "input_ids",
                     "shape": list(input_ids.shape),
                     "datatype": "INT64",
-                    "data": input_ids.flatten().tolist(),
+                    "data": input_ids.ravel(),
                 },
                 {
                     "name": "attention_mask",
                     "shape": list(attention_mask.shape),
                     "datatype": "INT64",
-                    "data": attention_mask.flatten().tolist(),
+                    "data": attention_mask.ravel(),
                 },
             ],
-            "outputs": [{"name": self.config.triton_output_name}],
+            "outputs": self._json_outputs,
         }
 
+    def _build_binary_request(
+        self, input_ids: np.ndarray, attention_mask: np.ndarray
+    ) -> Tuple[bytes, int]:
+        """
+        Constructs a binary-tensor request body for Triton.
+
+        The body is a small JSON header describing the tensors, followed by
+        their raw little-endian bytes in the same order. Returns the body and
+        the header length, which goes in the `Inference-Header-Content-Length`
+        request header.
+        """
+        batch, seq_len = input_ids.shape
+        header = _binary_request_header(batch, seq_len, self.config.triton_output_name)
+        body = b"".join((header, input_ids.tobytes(), attention_mask.tobytes()))
+        return body, len(header)
+
+    def _parse_triton_response(self, raw: bytes, header_length: Optional[str]) -> np.ndarray:
+        """
+        Extracts the configured output tensor from a Triton response body,
+        reading it straight from the binary trailer when the server sent one.
+        """
+        json_length = len(raw) if header_length is None else int(header_length)
+        response_json = orjson.loads(memoryview(raw)[:json_length])
+
+        output_data = next(
+            (out for out in response_json["outputs"] if out["name"] == self.config.triton_output_name),
+            None,
+        )
+        if output_data is None:
+            raise ValueError(f"Triton response did not contain '{self.config.triton_output_name}' output.")
+
+        shape = output_data["shape"]
+        binary_size = output_data.get("parameters", {}).get("binary_data_size")
+        if binary_size is None:
+            # JSON transport: Triton returns the tensor as a flat list, which
+            # fromiter copies straight into a pre-sized float32 array.
+            count = int(np.prod(shape))
+            return np.fromiter(output_data["data"], dtype=np.float32, count=count).reshape(shape)
+
+        dtype = _TRITON_DTYPES.get(output_data.get("datatype", "FP32"))
+        if dtype is None:
+            raise ValueError(f"Unsupported Triton output datatype '{output_data['datatype']}'.")
+        # Only one output is requested, so its bytes start right after the header
+        tensor = np.frombuffer(
+            raw, dtype=dtype, count=binary_size // np.dtype(dtype).itemsize, offset=json_length
+        )
+        return tensor.astype(np.float32, copy=False).reshape(shape)
+
+    def _tokenize(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encodes a batch with the Rust tokenizer, padded to the bucket length
+        of the longest text (see `_bucket_length`). Returns `input_ids` and
+        `attention_mask` as INT64 arrays.
+        """
+        encodings = self._encode_batch(texts)
+        seq_len = _bucket_length(max(len(enc.ids) for enc in encodings))
+        # Allocate the final padded tensors once and fill each row in place,
+        # rather than building ragged lists and padding/copying afterwards.
+        input_ids = np.full((len(encodings), seq_len), self._pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(encodings), seq_len), dtype=np.int64)
+        for row, enc in enumerate(encodings):
+            length = len(enc.ids)
+            input_ids[row, :length] = enc.ids
+            attention_mask[row, :length] = 1
+        return input_ids, attention_mask
+
     async def _embed_batch(
         self, texts: List[str], model_name: str
-    ) -> List[List[float]]:
-        """Asynchronously tokenizes, sends a request to Triton, and post-processes a single batch."""
+    ) -> np.ndarray:
+        """
+        Asynchronously tokenizes, sends a request to Triton, and post-processes
+        a single batch. Returns a [B, H] float32 array; conversion to Python
+        lists happens once, in `create`/`create_batch`.
+        """
         if not texts:
-            return []
+            return np.empty((0, 0), dtype=np.float32)
 
         api_url = f"{str(self.config.triton_url).rstrip('/')}/v2/models/{model_name}/infer"
-        tokens = self.tokenizer(
-            texts, padding=True, truncation=True, max_length=8192, return_tensors="np"
-        )
-        payload = self._build_triton_payload(
-            tokens["input_ids"].astype(np.int64),
-            tokens["attention_mask"].astype(np.int64),
-        )
+        # Tokenization is pure CPU work; keep it off the event loop
+        input_ids, attention_mask = await asyncio.to_thread(self._tokenize, texts)
+        if self.config.binary_tensors:
+            body, header_length = self._build_binary_request(input_ids, attention_mask)
+            headers = {
+                "Content-Type": "application/octet-stream",
+                INFERENCE_HEADER_LENGTH: str(header_length),
+            }
+        else:
+            body = orjson.dumps(
+                self._build_triton_payload(input_ids, attention_mask),
+                option=orjson.OPT_SERIALIZE_NUMPY,
+            )
+            headers = {"Content-Type": "application/json"}
         session = await self.client_session
         timeout = aiohttp.ClientTimeout(total=self.config.triton_request_timeout)
 
         try:
-            async with session.post(api_url, data=json.dumps(payload), timeout=timeout) as response:
+            async with session.post(api_url, data=body, headers=headers, timeout=timeout) as response:
                 response.raise_for_status()
-                response_json = await response.json()
+                raw = await response.read()
+                response_header_length = response.headers.get(INFERENCE_HEADER_LENGTH)
 
-            output_data = next(
-                (out for out in response_json["outputs"] if out["name"] == self.config.triton_output_name),
-                None,
-            )
-            if output_data is None:
-                raise ValueError(f"Triton response did not contain '{self.config.triton_output_name}' output.")
-
-            shape = output_data["shape"]
-            last_hidden_state = np.array(output_data["data"], dtype=np.float32).reshape(shape)
-            
-            # Perform mean pooling and L2 normalization (correct logic from your test script)
-            attention_mask = tokens["attention_mask"]
-            input_mask_expanded = np.expand_dims(attention_mask, -1)
-            sum_embeddings = np.sum(last_hidden_state * input_mask_expanded, 1)
-            sum_mask = np.maximum(input_mask_expanded.sum(1), 1e-9)
-            pooled_embeddings = sum_embeddings / sum_mask
-            normalized_embeddings = pooled_embeddings / np.linalg.norm(
-                pooled_embeddings, ord=2, axis=1, keepdims=True
-            )
-            return normalized_embeddings.tolist()
+            last_hidden_state = self._parse_triton_response(raw, response_header_length)
+
+            # A [B, H] output means the model (e.g. an ensemble with a pooling
+            # step) already mean-pooled and normalized on the server.
+            if last_hidden_state.ndim == 2:
+                return last_hidden_state
+
+            # Pooling scans the whole [B, S, H] state; NumPy releases the GIL
+            # for it, so run it in a thread like tokenization.
+            return await asyncio.to_thread(_mean_pool_and_normalize, last_hidden_state, attention_mask)
 
         except asyncio.TimeoutError:
             logger.error(f"TimeoutError: Request to Triton at {api_url} timed out after {self.config.triton_request_timeout} seconds.")
@@ -161,20 +356,40 @@ class JinaV3TritonEmbedder(EmbedderClient):
             raise TypeError(f"create() expects a non-empty string, but got {type(input_data)}")
 
         embeddings = await self._embed_batch([text_to_embed], self.config.query_model_name)
-        if not embeddings:
+        if len(embeddings) == 0:
             raise ValueError("API returned no embedding for the input.")
-        return embeddings[0]
+        return embeddings[0].tolist()
 
     async def create_batch(self, input_data_list: List[str]) -> List[List[float]]:
         """Creates embeddings for a batch of strings using the PASSAGE model."""
         if not input_data_list:
             return []
-        all_embeddings = []
-        for i in range(0, len(input_data_list), self.config.batch_size):
-            batch_texts = input_data_list[i : i + self.config.batch_size]
-            batch_embeddings = await self._embed_batch(batch_texts, self.config.passage_model_name)
-            all_embeddings.extend(batch_embeddings)
-        return all_embeddings
+        # Embed each distinct text once; `inverse` maps inputs to unique rows.
+        unique_index: Dict[str, int] = {}
+        inverse = [unique_index.setdefault(text, len(unique_index)) for text in input_data_list]
+        unique_texts = list(unique_index)
+        # Batch texts of similar length together so little of each batch is
+        # padding, then scatter the results back to the caller's order.
+        order = np.argsort([len(text) for text in unique_texts], kind="stable")
+        sorted_texts = [unique_texts[i] for i in order]
+        batch_size = self.config.batch_size
+        batches = await asyncio.gather(*(
+            self._embed_batch_limited(sorted_texts[i : i + batch_size], self.config.passage_model_name)
+            for i in range(0, len(sorted_texts), batch_size)
+        ))
+        sorted_embeddings = np.concatenate(batches)
+        embeddings = np.empty_like(sorted_embeddings)
+        embeddings[order] = sorted_embeddings
+        if len(unique_texts) < len(input_data_list):
+            embeddings = embeddings[inverse]
+        return embeddings.tolist()
+
+    async def _embed_batch_limited(
+        self, texts: List[str], model_name: str
+    ) -> np.ndarray:
+        """Runs `_embed_batch` once a slot among `max_in_flight` is free."""
+        async with self._in_flight:
+            return await self._embed_batch(texts, model_name)
 
     async def close(self):
         """Closes the underlying aiohttp client session if this instance created it."""
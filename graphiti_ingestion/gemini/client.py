@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import hashlib
+import importlib
+import inspect
 import logging
-import queue
+import pkgutil
 from asyncio import Future
-from typing import Any, Dict, List, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 from google.genai import types
 from pydantic import BaseModel
 
@@ -17,23 +22,90 @@ from graphiti_core.llm_client.config import LLMConfig, ModelSize
 from graphiti_core.llm_client.gemini_client import (
     MULTILINGUAL_EXTRACTION_RESPONSES,
 )
+import graphiti_core.prompts
 from graphiti_core.prompts.models import Message
 
 from .manager import ComprehensiveManager
 from .worker import GeminiAPIWorker
 
+__all__ = ["ManagedGeminiClient"]
+
 logger = logging.getLogger(__name__)
 
+# Number of parsed responses kept when the client is created with cache=True.
+RESPONSE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=128)
+def _schema_for(model: type[BaseModel]) -> Dict[str, Any]:
+    """
+    Returns the JSON schema of a response model, built once per class.
+
+    Treat the result as read-only: it is shared by every request for `model`.
+    """
+    return model.model_json_schema()
+
+
+@lru_cache(maxsize=64)
+def _with_multilingual_suffix(content: str) -> str:
+    """
+    Appends graphiti's multilingual extraction instructions to a prompt,
+    reusing the result when the same prompt text comes around again.
+    """
+    return content + MULTILINGUAL_EXTRACTION_RESPONSES
+
+
+@lru_cache(maxsize=1)
+def _warm_schema_cache() -> int:
+    """
+    Pre-builds the schema of every response model in `graphiti_core.prompts`.
+
+    Runs once per process, at client construction, so no episode pays the
+    schema build on its first call for a given prompt. Returns the number of
+    models warmed.
+    """
+    warmed = 0
+    for module_info in pkgutil.iter_modules(graphiti_core.prompts.__path__):
+        try:
+            module = importlib.import_module(f"{graphiti_core.prompts.__name__}.{module_info.name}")
+        except Exception as e:
+            logger.debug(f"Skipping schema warm-up for prompt module {module_info.name}: {e}")
+            continue
+        for _, obj in inspect.getmembers(module, inspect.isclass):
+            if issubclass(obj, BaseModel) and obj is not BaseModel and obj.__module__ == module.__name__:
+                try:
+                    _schema_for(obj)
+                    warmed += 1
+                except Exception as e:
+                    logger.debug(f"Could not build schema for {obj.__qualname__}: {e}")
+    return warmed
+
+
+def _response_cache_key(
+    messages: List[Message],
+    response_model: type[BaseModel] | None,
+    max_tokens: int | None,
+) -> bytes:
+    """Hashes everything that determines a response: prompt, schema and token cap."""
+    digest = hashlib.blake2b(
+        orjson.dumps([[m.role, m.content] for m in messages]), digest_size=16
+    )
+    if response_model is not None:
+        digest.update(f"{response_model.__module__}.{response_model.__qualname__}".encode())
+    digest.update(str(max_tokens).encode())
+    return digest.digest()
+
 
 class ManagedGeminiClient(LLMClient):
     """
     An async-safe Gemini client compatible with `graphiti-core`.
 
-    This client offloads all API calls to a dedicated synchronous worker thread.
-    This ensures strict, sequential execution to manage rate limits and API key
-    rotation effectively. It uses an internal state variable (`_is_retry_request`)
-    as a "side channel" to communicate retry attempts to the worker, a workaround
-    for `graphiti-core`'s inability to pass custom arguments.
+    This client offloads all API calls to a pool of asyncio worker tasks that
+    share per-key token buckets, so rate limits and API key rotation are
+    managed in one place while requests on different keys overlap. It uses an
+    internal state variable (`_is_retry_request`) as a "side channel" to
+    communicate retry attempts to the worker, a workaround for `graphiti-core`'s
+    inability to pass custom arguments.
     """
 
     def __init__(
@@ -42,22 +114,30 @@ class ManagedGeminiClient(LLMClient):
         config: LLMConfig | None = None,
         cache: bool = False,
         global_cooldown_seconds: float = 1.0,
+        worker_concurrency: int = 0,
     ):
         super().__init__(config or LLMConfig(), cache)
         self.manager = manager
         self.config = config or LLMConfig()
-        self._work_queue: queue.Queue = queue.Queue()
+        self._work_queue: asyncio.Queue = asyncio.Queue()
+        # `worker_concurrency` tasks (default: one per API key) consume the
+        # queue; they start on the first request.
         self._worker = GeminiAPIWorker(
             manager=self.manager,
             work_queue=self._work_queue,
             delay_between_calls=global_cooldown_seconds,
+            concurrency=worker_concurrency or len(self.manager.api_keys),
         )
-        self._worker.start()
 
         # Internal state to signal a retry attempt to the worker
         self._is_retry_request: bool = False
 
-        logger.info("ManagedGeminiClient initialized and worker thread started.")
+        # In-memory LRU of serialized responses, only when caching is enabled.
+        # Values are orjson bytes so every hit hands out a fresh dict.
+        self._response_cache: Optional[OrderedDict[bytes, bytes]] = OrderedDict() if cache else None
+
+        warmed = _warm_schema_cache()
+        logger.info(f"ManagedGeminiClient initialized ({warmed} response schemas pre-built).")
 
     def set_retry_state(self, is_retry: bool) -> None:
         """
@@ -72,11 +152,10 @@ class ManagedGeminiClient(LLMClient):
         """
         self._is_retry_request = is_retry
 
-    def close(self) -> None:
-        """Shuts down the worker thread cleanly."""
-        if self._worker.is_alive():
-            self._work_queue.put(None)
-            self._worker.join(timeout=5.0)  # Prevent hanging on shutdown
+    async def close(self) -> None:
+        """Shuts down the worker tasks cleanly."""
+        if self._worker.is_running:
+            await self._worker.stop(timeout=5.0)  # Prevent hanging on shutdown
             logger.info("ManagedGeminiClient worker has been closed.")
 
     async def _execute_job(
@@ -89,17 +168,17 @@ class ManagedGeminiClient(LLMClient):
         Submits a job to the worker's queue and awaits the result.
 
         Args:
-            messages: The list of messages for the prompt.
+            messages: The messages for the prompt.
             gen_config: The generation configuration dictionary.
             retry_count: The number of times this job has been attempted.
 
         Returns:
             A tuple containing the API response and the name of the model used.
         """
-        loop = asyncio.get_running_loop()
-        future: Future = loop.create_future()
+        self._worker.ensure_started()
+        future: Future = asyncio.get_running_loop().create_future()
         # The job tuple now includes the retry_count for the worker
-        self._work_queue.put((messages, gen_config, future, loop, retry_count))
+        self._work_queue.put_nowait((messages, gen_config, future, retry_count))
         return await future
 
     async def _generate_response(
@@ -114,9 +193,10 @@ class ManagedGeminiClient(LLMClient):
         and parses the final response.
         """
         system_prompt = ""
+        prompt_messages = messages
         if messages and messages[0].role == "system":
             system_prompt = messages[0].content or ""
-            messages = messages[1:]
+            prompt_messages = messages[1:]
 
         # Base generation config. The worker will override max_output_tokens.
         generation_config = {
@@ -124,7 +204,7 @@ class ManagedGeminiClient(LLMClient):
             "max_output_tokens": max_tokens or 8192,
             "response_mime_type": "application/json" if response_model else "text/plain",
             "response_schema": (
-                response_model.model_json_schema() if response_model else None
+                _schema_for(response_model) if response_model else None
             ),
         }
         # The google-genai library expects system_instruction to be a top-level
@@ -136,7 +216,7 @@ class ManagedGeminiClient(LLMClient):
         try:
             retry_count_for_worker = 1 if self._is_retry_request else 0
             response, used_model = await self._execute_job(
-                messages, generation_config, retry_count_for_worker
+                prompt_messages, generation_config, retry_count_for_worker
             )
         except Exception as e:
             logger.error(f"ManagedGeminiClient: job failed in worker: {e}")
@@ -152,8 +232,10 @@ class ManagedGeminiClient(LLMClient):
 
         if response_model:
             try:
-                validated = response_model.model_validate_json(raw_output)
-                return validated.model_dump()
+                # pydantic-core parses and validates straight from the JSON
+                # text in one pass; the dump carries the model's defaults and
+                # coercions rather than the raw JSON.
+                return response_model.model_validate_json(raw_output).model_dump()
             except Exception as e:
                 logger.error(f"Failed to parse JSON from model {used_model}. Raw output: {raw_output}")
                 raise ValueError(f"Failed to parse structured JSON from {used_model}: {e}") from e
@@ -175,11 +257,33 @@ class ManagedGeminiClient(LLMClient):
         must be set via `set_retry_state()` before this method is called.
         """
         if messages and messages[0].content:
-            messages[0].content += MULTILINGUAL_EXTRACTION_RESPONSES
+            # Augment a copy: the caller may resend the same Message objects on
+            # a retry, and mutating them would stack the suffix each time.
+            first = messages[0].model_copy(
+                update={"content": _with_multilingual_suffix(messages[0].content)}
+            )
+            messages = [first, *messages[1:]]
 
-        return await self._generate_response(
+        cache_key = None
+        if self._response_cache is not None:
+            cache_key = _response_cache_key(messages, response_model, max_tokens)
+            # A retry means the previous answer was not usable; ask the model again.
+            cached = None if self._is_retry_request else self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                logger.debug("ManagedGeminiClient: response served from cache.")
+                return orjson.loads(cached)
+
+        result = await self._generate_response(
             messages=messages,
             response_model=response_model,
             max_tokens=max_tokens,
             model_size=model_size,
-        )
\ No newline at end of file
+        )
+
+        if cache_key is not None:
+            self._response_cache[cache_key] = orjson.dumps(result)
+            self._response_cache.move_to_end(cache_key)
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        return result
\ No newline at end of file
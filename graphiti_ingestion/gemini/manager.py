@@ -3,18 +3,130 @@
 from __future__ import annotations
 
 import csv
+import heapq
 import logging
+import os
 import threading
 import time
+import orjson
 import yaml
-from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
 from enum import Enum, auto
-from itertools import cycle
 from pathlib import Path
 from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Cooldown arithmetic runs on the monotonic clock, immune to wall-clock jumps.
+_now = time.monotonic
+
+# Requests-per-minute assumed for models whose config has no `rpm` entry.
+DEFAULT_MODEL_RPM = 5
+
+# Prefer the libyaml-backed loader when PyYAML was built with it.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader as _YamlLoader
+
+
+@lru_cache(maxsize=8)
+def _read_api_keys(csv_path: str, mtime_ns: int) -> Tuple[str, ...]:
+    """
+    Parses the API key CSV. Cached on (path, mtime) so repeated manager
+    constructions in the same process skip the file I/O entirely.
+    """
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if "api" not in header:
+            raise ValueError(f"CSV file '{csv_path}' must have an 'api' header.")
+        idx = header.index("api")
+        return tuple(
+            key for key in (row[idx].strip() for row in reader if len(row) > idx) if key
+        )
+
+
+@lru_cache(maxsize=8)
+def _read_model_config(yaml_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Parses the model config YAML. Cached on (path, mtime, size) like the keys,
+    and across processes in a sibling `<name>.cache.json` that records the
+    YAML's (mtime, size) and is only reused when both match exactly, so a
+    replacement that keeps an older mtime (`cp -p`, `rsync -t`, tar) still
+    invalidates it.
+    """
+    cache_path = yaml_path + ".cache.json"
+    source = [mtime_ns, size]
+    try:
+        with open(cache_path, "rb") as f:
+            cached = orjson.loads(f.read())
+        if isinstance(cached, dict) and cached.get("source") == source:
+            return cached["config"]
+    except (OSError, KeyError, orjson.JSONDecodeError):
+        pass
+
+    with open(yaml_path, encoding="utf-8") as f:
+        config = yaml.load(f, Loader=_YamlLoader)
+
+    # Best effort: a read-only config dir just means no cache next time.
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps({"source": source, "config": config}))
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError):
+        logger.debug(f"Could not write model config cache '{cache_path}'", exc_info=True)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return config
+
+
+@dataclass
+class TokenBucket:
+    """
+    A refilling token bucket that paces calls against one (API key, model)
+    quota: up to `capacity` calls in a burst, refilled at `rate_per_sec`.
+    """
+    capacity: float
+    rate_per_sec: float
+    tokens: float = field(init=False)
+    last_refill: float = field(default_factory=_now)
+
+    def __post_init__(self) -> None:
+        self.tokens = self.capacity
+
+    def refill(self, now: float) -> None:
+        """Adds the tokens accrued since the last refill, capped at capacity."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate_per_sec)
+        self.last_refill = now
+
+    def try_acquire(self, now: float) -> bool:
+        """Takes one token if available."""
+        self.refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def seconds_until_available(self, now: float) -> float:
+        """Time until one token will be available."""
+        self.refill(now)
+        return max(0.0, (1.0 - self.tokens) / self.rate_per_sec)
+
+
+@dataclass
+class _Rotation:
+    """
+    A fixed round-robin order of (api_key, model_name) pairs. `cursor` is the
+    index to try next and is only read or moved while holding the manager lock.
+    """
+    pairs: Tuple[Tuple[str, str], ...]
+    cursor: int = 0
+
 
 class TaskType(Enum):
     """
@@ -35,7 +147,8 @@ class ComprehensiveManager:
 
     This thread-safe class handles:
       - Loading and cycling through multiple API keys from a CSV.
-      - Enforcing a cooldown period on keys after use.
+      - Rate-limiting each (key, model) pair with a shared token bucket.
+      - Benching throttled keys for a cooldown period.
       - Loading model configurations and capabilities from a YAML file.
       - Intelligently selecting models for tasks, with a special mode to
         force the most capable model for retry attempts.
@@ -52,28 +165,30 @@ class ComprehensiveManager:
         self.models_config: Dict[str, Any] = self._load_model_config(model_config_path)
         self.api_key_cooldown_seconds: float = api_key_cooldown_seconds
 
-        # Cooldown tracking for API keys
+        # Cooldown tracking for API keys. `cooldowns` maps every key that is
+        # currently cooling to its expiry (time.monotonic()); `_cooling` is a
+        # min-heap of the same expiries so releasing them is O(log N).
         self.cooldowns: Dict[str, float] = {}
+        self._cooling: List[Tuple[float, str]] = []
 
-        # Round-robin generator for cycling through (api_key, model_name) pairs
-        self._client_cycle: Dict[TaskType, Iterator] = {}
+        # Round-robin rotations of (api_key, model_name) pairs per task, plus a
+        # best-model-only rotation used for retries. Each rotation is an
+        # immutable tuple of pairs with a shared counter as its cursor.
+        self._ready: Dict[TaskType, _Rotation] = {}
+        self._best_ready: Dict[TaskType, _Rotation] = {}
         self._init_client_generators()
 
+        # Per-(api_key, model) request-rate limiters, shared by every worker
+        # that draws clients from this manager.
+        self._limiters: Dict[Tuple[str, str], TokenBucket] = {}
+
     def _load_api_keys(self, csv_path: str) -> List[str]:
         """Loads API keys from a CSV file with an 'api' header."""
         path = Path(csv_path)
         if not path.exists():
             raise FileNotFoundError(f"API key CSV not found at: {csv_path}")
 
-        keys: List[str] = []
-        with open(path, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            if "api" not in (reader.fieldnames or []):
-                raise ValueError(f"CSV file '{csv_path}' must have an 'api' header.")
-            for row in reader:
-                key = row.get("api", "").strip()
-                if key:
-                    keys.append(key)
+        keys = list(_read_api_keys(str(path), os.stat(path).st_mtime_ns))
         if not keys:
             raise ValueError(f"No API keys found in '{csv_path}'.")
         logger.info(f"Loaded {len(keys)} API keys.")
@@ -84,21 +199,26 @@ class ComprehensiveManager:
         path = Path(yaml_path)
         if not path.exists():
             raise FileNotFoundError(f"Model config YAML not found at: {yaml_path}")
-        with open(path, encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+        stat = os.stat(path)
+        config = _read_model_config(str(path), stat.st_mtime_ns, stat.st_size)
         logger.info("Model configuration loaded successfully.")
         return config
 
     def _init_client_generators(self) -> None:
-        """Pre-builds the round-robin iterators for each TaskType."""
+        """Pre-builds the round-robin rotations for each TaskType."""
         tasks = self.models_config.get("tasks", {})
         for task_name, task_info in tasks.items():
             try:
                 task_enum = TaskType[task_name]
                 models = task_info.get("models", [])
                 if models:
-                    clients = [(k, m) for k in self.api_keys for m in models]
-                    self._client_cycle[task_enum] = cycle(clients)
+                    self._ready[task_enum] = _Rotation(
+                        tuple((k, m) for k in self.api_keys for m in models)
+                    )
+                    # By convention, the "best" (most capable) model is last in the list
+                    self._best_ready[task_enum] = _Rotation(
+                        tuple((k, models[-1]) for k in self.api_keys)
+                    )
             except KeyError:
                 logger.warning(f"Task type '{task_name}' in YAML config is not a valid TaskType enum member.")
 
@@ -114,6 +234,23 @@ class ComprehensiveManager:
         """
         return self.models_config.get("models", {}).get(model_name)
 
+    def limiter_for(self, api_key: str, model_name: str) -> TokenBucket:
+        """
+        Returns the token bucket pacing calls for an (API key, model) pair,
+        sized from the model's `rpm` and created on first use. All workers
+        built on this manager share it, so their calls count against the
+        same quota. This is a thread-safe operation.
+        """
+        limiter = self._limiters.get((api_key, model_name))
+        if limiter is None:
+            model_cfg = self.get_model_config(model_name) or {}
+            rpm = float(model_cfg.get("rpm", DEFAULT_MODEL_RPM))
+            with self._lock:
+                limiter = self._limiters.setdefault(
+                    (api_key, model_name), TokenBucket(capacity=rpm, rate_per_sec=rpm / 60.0)
+                )
+        return limiter
+
     def get_available_client_details(
         self,
         task_type: TaskType,
@@ -122,7 +259,9 @@ class ComprehensiveManager:
         """
         Yields (API key, model name) pairs, skipping keys on cooldown.
 
-        On a retry, this can be forced to use only the most capable model.
+        Each `next()` advances the rotation, so a caller can keep drawing
+        fresh clients for successive retry attempts. On a retry, this can be
+        forced to use only the most capable model.
 
         Args:
             task_type: The category of task to perform (e.g., TEXT_TO_TEXT).
@@ -135,47 +274,116 @@ class ComprehensiveManager:
         Raises:
             RuntimeError: If all available API keys are on cooldown.
         """
-        if task_type not in self._client_cycle:
+        if force_best_model and task_type in self._best_ready:
+            logger.info(f"Forcing best model for retry: {self._best_ready[task_type].pairs[0][1]}")
+
+        while True:
+            client = self.next_client(task_type, force_best_model)
+            if client is None:
+                raise RuntimeError("All available API keys are currently on cooldown. Please wait or add more keys.")
+            yield client
+
+    def next_client(
+        self,
+        task_type: TaskType,
+        force_best_model: bool = False,
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Advances the task's rotation to the next (API key, model name) pair
+        whose key is off cooldown. This is a thread-safe operation.
+
+        Returns:
+            The pair, or None if every key is cooling; `seconds_until_key_ready`
+            then says how long until one returns.
+
+        Raises:
+            ValueError: If the task has no models configured.
+        """
+        if task_type not in self._ready:
             raise ValueError(f"No model mapping found for task: {task_type}")
+        rotation = (self._best_ready if force_best_model else self._ready)[task_type]
+        with self._lock:
+            return self._next_ready_client(rotation)
+
+    def seconds_until_key_ready(self) -> float:
+        """
+        Time until at least one API key is off cooldown (0.0 if one already is).
+        This is a thread-safe operation.
+        """
+        with self._lock:
+            now = _now()
+            self._release_expired_cooldowns(now)
+            if len(self.cooldowns) < len(self.api_keys) or not self._cooling:
+                return 0.0
+            # The heap top is the earliest expiry; a stale entry only wakes us early.
+            return max(0.0, self._cooling[0][0] - now)
 
-        client_generator: Iterator[Tuple[str, str]]
+    def rotation_size(self, task_type: TaskType, force_best_model: bool = False) -> int:
+        """Number of distinct (API key, model) pairs `get_available_client_details` rotates over."""
+        rotations = self._best_ready if force_best_model else self._ready
+        rotation = rotations.get(task_type)
+        return len(rotation.pairs) if rotation else 0
 
-        if force_best_model:
-            tasks = self.models_config.get("tasks", {})
-            model_list = tasks.get(task_type.name, {}).get("models", [])
-            # By convention, the "best" (most capable) model is last in the list
-            best_model = model_list[-1] if model_list else None
-            if not best_model:
-                raise ValueError(f"Could not determine the best model for task {task_type.name}")
-            
-            logger.info(f"Forcing best model for retry: {best_model}")
-            clients = [(key, best_model) for key in self.api_keys]
-            client_generator = cycle(clients)
-        else:
-            client_generator = self._client_cycle[task_type]
-        
-        max_checks = len(self.api_keys) * 5 # Prevent potential infinite loops
-        for _ in range(max_checks):
-            api_key, model_name = next(client_generator)
-            if not self._is_on_cooldown(api_key):
-                yield api_key, model_name
-                return # Exit after yielding one valid client
-        
-        raise RuntimeError("All available API keys are currently on cooldown. Please wait or add more keys.")
+    def _next_ready_client(self, rotation: _Rotation) -> Optional[Tuple[str, str]]:
+        """
+        Rotates to the next pair whose key is off cooldown. Must hold `_lock`.
+
+        Returns None straight away when every key is cooling instead of
+        spinning over the rotation.
+        """
+        self._release_expired_cooldowns(_now())
+        if len(self.cooldowns) >= len(self.api_keys):
+            return None
+        pairs = rotation.pairs
+        n = len(pairs)
+        start = rotation.cursor
+        for i in range(n):
+            client = pairs[(start + i) % n]
+            if client[0] not in self.cooldowns:
+                # Resume after the returned pair, past any cooling ones skipped.
+                rotation.cursor = (start + i + 1) % n
+                return client
+        return None
 
-    def _is_on_cooldown(self, api_key: str) -> bool:
-        """Checks if a given API key is currently in its cooldown period."""
-        return time.time() < self.cooldowns.get(api_key, 0)
+    def _release_expired_cooldowns(self, now: float) -> None:
+        """Pops every expired entry off the cooldown heap. Must hold `_lock`."""
+        cooling = self._cooling
+        while cooling and cooling[0][0] <= now:
+            expiry, api_key = heapq.heappop(cooling)
+            # A key re-marked since this entry was pushed has a later expiry.
+            if self.cooldowns.get(api_key) == expiry:
+                del self.cooldowns[api_key]
 
     def mark_key_cooldown(self, api_key: str) -> None:
         """
-        Marks a key as used, putting it on cooldown for the configured duration.
+        Puts a key on cooldown for the configured duration, e.g. after the API
+        throttled it. Per-call pacing is the token buckets' job, not this.
         This is a thread-safe operation.
         """
         with self._lock:
-            self.cooldowns[api_key] = time.time() + self.api_key_cooldown_seconds
-            logger.debug(f"Cooldown set for key ...{api_key[-4:]} for {self.api_key_cooldown_seconds}s")
+            self._set_cooldown(api_key)
+
+    def record_success(self, api_key: str, model_name: str, tokens: int) -> None:
+        """
+        Records a completed call's token usage. The key is not cooled: its
+        request rate is already paced by the (key, model) token bucket.
+        This is a thread-safe operation.
+        """
+        with self._lock:
+            self._update_tpm(api_key, model_name, tokens)
+
+    def _set_cooldown(self, api_key: str) -> None:
+        """Puts a key on cooldown for the configured duration. Must hold `_lock`."""
+        expiry = _now() + self.api_key_cooldown_seconds
+        self.cooldowns[api_key] = expiry
+        heapq.heappush(self._cooling, (expiry, api_key))
+        logger.debug(f"Cooldown set for key ...{api_key[-4:]} for {self.api_key_cooldown_seconds}s")
 
     def update_tpm(self, api_key: str, model_name: str, tokens: int) -> None:
-        """Placeholder for potential future TPM enforcement."""
+        """Records token usage for a (key, model) pair. Thread-safe."""
+        with self._lock:
+            self._update_tpm(api_key, model_name, tokens)
+
+    def _update_tpm(self, api_key: str, model_name: str, tokens: int) -> None:
+        """Placeholder for potential future TPM enforcement. Must hold `_lock`."""
         pass
\ No newline at end of file
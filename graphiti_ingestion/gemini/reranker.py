@@ -3,11 +3,10 @@
 from __future__ import annotations
 
 import asyncio
-import json
-import queue
 import typing
 from asyncio import Future
 
+import orjson
 from google.genai import types
 from pydantic import BaseModel, Field
 
@@ -41,6 +40,19 @@ class RerankResponse(BaseModel):
     reranked_documents: list[RerankedDocument]
 
 
+# The response schema and the instruction embedding it never change, so build
+# them once rather than regenerating the Pydantic schema on every rank call.
+_RERANK_SCHEMA: dict[str, typing.Any] = RerankResponse.model_json_schema()
+_RERANK_SCHEMA_STR = orjson.dumps(_RERANK_SCHEMA).decode("utf-8")
+_RERANK_INSTRUCTION = (
+    "You are an expert reranker. Given a query and a list of documents, "
+    "you must reorder the documents from most to least relevant to the query. "
+    "Provide a relevance score between 0.0 and 1.0 for each document. "
+    f"Your output MUST be a valid JSON object matching this schema: {_RERANK_SCHEMA_STR}"
+)
+_RERANK_SYSTEM_MSG = Message(role="system", content=_RERANK_INSTRUCTION)
+
+
 # CORRECTED CLASS DEFINITION: Inherits from CrossEncoderClient
 class ManagedGeminiReranker(CrossEncoderClient):
     """
@@ -57,30 +69,30 @@ class ManagedGeminiReranker(CrossEncoderClient):
         self.manager = manager
         self.config = config or LLMConfig()
 
-        self._work_queue: queue.Queue = queue.Queue()
+        self._work_queue: asyncio.Queue = asyncio.Queue()
+        # The worker task starts on the first rerank request.
         self._worker = GeminiAPIWorker(
             manager=self.manager,
             work_queue=self._work_queue,
             delay_between_calls=global_cooldown_seconds
         )
-        self._worker.start()
-        logger.info("ManagedGeminiReranker worker thread started.")
+        logger.info("ManagedGeminiReranker initialized.")
 
-    def close(self) -> None:
+    async def close(self) -> None:
         """Gracefully stop the reranker worker."""
-        if self._worker.is_alive():
-            self._work_queue.put(None)
-            self._worker.join()
+        if self._worker.is_running:
+            await self._worker.stop()
             logger.info("ManagedGeminiReranker worker has been closed.")
 
     async def _execute_job(
         self,
         messages: list[Message],
-        gen_config: types.GenerateContentConfig
+        gen_config: dict[str, typing.Any]
     ) -> tuple[types.GenerateContentResponse, str]:
-        loop = asyncio.get_running_loop()
-        future: Future = loop.create_future()
-        self._work_queue.put((messages, gen_config, future, loop))
+        self._worker.ensure_started()
+        future: Future = asyncio.get_running_loop().create_future()
+        # Reranking is never a retried episode, so retry_count is always 0.
+        self._work_queue.put_nowait((messages, gen_config, future, 0))
         return await future
 
     # CORRECTED METHOD: Renamed to `rank` with the required signature.
@@ -95,29 +107,20 @@ class ManagedGeminiReranker(CrossEncoderClient):
         if len(passages) == 1:
             return [(passages[0], 1.0)]
 
-        # Updated instruction to request a specific JSON format.
-        instruction = (
-            "You are an expert reranker. Given a query and a list of documents, "
-            "you must reorder the documents from most to least relevant to the query. "
-            "Provide a relevance score between 0.0 and 1.0 for each document. "
-            f"Your output MUST be a valid JSON object matching this schema: {RerankResponse.model_json_schema()}"
-        )
-
-        system_msg = Message(role="system", content=instruction)
         user_msg = Message(
             role="user",
-            content=json.dumps({"query": query, "documents": passages}, ensure_ascii=False)
-        )
-        messages = [system_msg, user_msg]
-
-        generation_config = types.GenerateContentConfig(
-            temperature=0.0,
-            max_output_tokens=8192,
-            response_mime_type="application/json",
-            # --- THIS IS THE CORRECTED LINE ---
-            response_schema=RerankResponse.model_json_schema(),
-            # --- END OF CORRECTION ---
+            content=orjson.dumps({"query": query, "documents": passages}).decode("utf-8")
         )
+        messages = [_RERANK_SYSTEM_MSG, user_msg]
+
+        # A plain dict, like ManagedGeminiClient's, so the shared worker can
+        # override max_output_tokens per model before building the config.
+        generation_config = {
+            "temperature": 0.0,
+            "max_output_tokens": 8192,
+            "response_mime_type": "application/json",
+            "response_schema": _RERANK_SCHEMA,
+        }
 
         try:
             # The _execute_job will return a dictionary pre-validated against RerankResponse
@@ -136,7 +139,7 @@ class ManagedGeminiReranker(CrossEncoderClient):
             return [(p, 0.5) for p in passages]
 
     async def _execute_job_with_model(
-        self, messages: list[Message], gen_config: types.GenerateContentConfig
+        self, messages: list[Message], gen_config: dict[str, typing.Any]
     ) -> dict[str, typing.Any]:
         """Helper to execute job and parse with the internal Pydantic model."""
         try:
@@ -150,7 +153,7 @@ class ManagedGeminiReranker(CrossEncoderClient):
             raise ValueError(f"Model {used_model} returned no text for reranking.")
         try:
             # The API should already return validated JSON, but we re-validate for safety.
-            validated = RerankResponse.model_validate(json.loads(raw_output))
+            validated = RerankResponse.model_validate_json(raw_output)
             return validated.model_dump()
         except Exception as e:
             raise ValueError(
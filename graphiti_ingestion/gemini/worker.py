@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-import queue
+import asyncio
 import random
-import threading
+import re
 import time
-from typing import Any, Iterable, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from google import genai
 from google.genai import errors as genai_errors
@@ -17,149 +18,277 @@ from graphiti_ingestion.gemini.manager import ComprehensiveManager, TaskType
 import logging
 logger = logging.getLogger(__name__)
 
+# HTTP statuses worth retrying on another key/model.
+_RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+# Transport-level failures that surface as plain exceptions, not APIErrors.
+_NETWORK_HINTS_RE = re.compile(
+    r"timeout|timed out|temporar(?:ily|y)|unavailable|connection reset|connection aborted",
+    re.IGNORECASE,
+)
+
+# Retry policy: decorrelated-jitter backoff from a 2s base, capped at 120s,
+# over at most 10 attempts per job.
+DEFAULT_MAX_ATTEMPTS = 10
+DEFAULT_BASE_BACKOFF = 2.0
+DEFAULT_MAX_BACKOFF = 120.0
+
+# Safety thresholds sent with every request; identical for all calls.
+_SAFETY_SETTINGS: Dict[str, str] = {
+    'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
+    'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
+    'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE',
+    'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE',
+}
+
+# graphiti message roles that the Gemini API names differently.
+_ROLE_MAP: Dict[str, str] = {"assistant": "model"}
+
+
+@lru_cache(maxsize=512)
+def _contents_from_pairs(pairs: Tuple[Tuple[str, str], ...]) -> Tuple[types.Content, ...]:
+    """Builds the SDK `types.Content` objects for a tuple of (role, text) pairs."""
+    return tuple(types.Content(role=role, parts=[types.Part(text=text)]) for role, text in pairs)
+
 
 def _to_contents(messages: Iterable[Any]) -> List[types.Content]:
     """
     Converts a list of Pydantic `Message` objects into the google-genai SDK's
     `types.Content` objects.
 
+    The conversion is memoized on the (role, text) pairs, so a prompt that is
+    sent again (e.g. a retried job) reuses the already-built objects.
+
     Args:
         messages: An iterable of `graphiti_core.prompts.models.Message` objects.
 
     Returns:
         A list of `types.Content` objects ready for the API.
     """
-    out: List[types.Content] = []
-    for m in messages:
-        # ---> THIS IS THE CORRECTED LOGIC <---
-        # Access attributes directly on the 'Message' object (m.role)
-        # instead of treating it like a dictionary (m.get("role")).
-        role = m.role if hasattr(m, "role") else "user"
-        if role == "assistant":
-            role = "model"
-        
-        content = m.content if hasattr(m, "content") else ""
-        if content is None:
-            content = ""
-        # ---> END OF CORRECTION <---
-
-        out.append(types.Content(role=role, parts=[types.Part(text=content)]))
-    return out
+    pairs = tuple((_ROLE_MAP.get(m.role, m.role), m.content or "") for m in messages)
+    return list(_contents_from_pairs(pairs))
 
 
 def _is_retryable_exception(exc: BaseException) -> Tuple[bool, Optional[int]]:
     """
     Determines if an exception is retryable.
     """
-    if isinstance(exc, genai_errors.ServerError):
-        return True, getattr(exc, 'code', 500)
-    if isinstance(exc, genai_errors.ClientError):
-        return getattr(exc, 'code', 400) == 429, getattr(exc, 'code', 400)
-    msg = str(exc).lower()
-    if any(h in msg for h in ("timeout", "connection reset", "unavailable")):
-        return True, None
-    return False, None
+    code = None
+    if isinstance(exc, genai_errors.APIError):
+        code = getattr(exc, 'code', None)
+        # Any 5xx is transient; among client errors only 408/429 are retryable.
+        if isinstance(exc, genai_errors.ServerError) or code in _RETRYABLE_STATUSES:
+            return True, code
+        if isinstance(exc, genai_errors.ClientError):
+            return False, code
+    # No recognised status: fall back to the message, as for transport errors.
+    if _NETWORK_HINTS_RE.search(str(exc)):
+        return True, code
+    return False, code
 
 
-class GeminiAPIWorker(threading.Thread):
+class GeminiAPIWorker:
     """
-    A dedicated, synchronous worker that processes API requests one at a time.
+    An asyncio worker pool that processes queued Gemini API requests.
+
+    Jobs are consumed from an `asyncio.Queue` by `concurrency` tasks running on
+    the caller's event loop, and each call goes through the SDK's async client
+    (`client.aio`). Pacing, backoff and quota waits all `await`, so they never
+    block the loop, and results are set on the job's future directly.
     """
 
     def __init__(
         self,
         manager: ComprehensiveManager,
-        work_queue: queue.Queue,
+        work_queue: asyncio.Queue,
         delay_between_calls: float = 1.0,
-        max_attempts: int = 5,
-        base_backoff: float = 1.0,
-        max_backoff: float = 10.0,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_backoff: float = DEFAULT_BASE_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        concurrency: int = 1,
     ):
-        super().__init__(daemon=True)
         self.manager = manager
         self.work_queue = work_queue
         self.delay_between_calls = delay_between_calls
         self.max_attempts = max_attempts
         self.base_backoff = base_backoff
         self.max_backoff = max_backoff
+        self.concurrency = max(1, concurrency)
+
+        self._tasks: List[asyncio.Task] = []
+        # Next permitted call time per (api_key, model); `delay_between_calls`
+        # spaces calls on the same pair only, so throughput scales with keys.
+        self._next_call_at: Dict[Tuple[str, str], float] = {}
+        # One SDK client per API key, reused across jobs so its HTTP
+        # connections stay warm. Bounded by the number of keys.
+        self._clients: Dict[str, genai.Client] = {}
+
+    @property
+    def is_running(self) -> bool:
+        """True while at least one worker task is still alive."""
+        return any(not task.done() for task in self._tasks)
+
+    def ensure_started(self) -> None:
+        """Spawns the worker tasks on the running event loop if not yet running."""
+        if self.is_running:
+            return
+        self._tasks = [
+            asyncio.create_task(self.run(), name=f"gemini-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(f"Started {self.concurrency} Gemini API worker task(s).")
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Signals every worker task to exit and waits for them to finish."""
+        if not self.is_running:
+            return
+        for _ in self._tasks:
+            self.work_queue.put_nowait(None)
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:  # Prevent hanging on shutdown
+            task.cancel()
+        self._tasks = []
 
-    def _sleep_with_jitter(self, attempt_idx: int) -> None:
-        """Pauses execution using a linear backoff strategy with random jitter."""
-        backoff = min(self.max_backoff, self.base_backoff * (attempt_idx + 1))
-        time.sleep(backoff * (0.5 + random.random()))
+    def _client_for(self, api_key: str) -> genai.Client:
+        """Returns the cached `genai.Client` for an API key, creating it once."""
+        client = self._clients.get(api_key)
+        if client is None:
+            client = self._clients[api_key] = genai.Client(api_key=api_key)
+        return client
 
-    def run(self) -> None:
-        """The main loop of the worker thread."""
-        logger.info("Synchronous Gemini API Worker has started.")
+    async def _acquire_client(self, force_best_model: bool) -> Tuple[str, str]:
+        """
+        Draws clients from the manager until one has quota left in its bucket.
+
+        Each round checks every distinct (key, model) pair in the rotation at
+        most once. It only waits when none of them has a token, or when every
+        key is cooling off after throttling, and then only until the soonest
+        bucket refills or key returns.
+        """
+        task_type = TaskType.TEXT_TO_TEXT
+        probes = max(1, self.manager.rotation_size(task_type, force_best_model=force_best_model))
         while True:
-            job = None
+            wait: Optional[float] = None
+            checked: Set[Tuple[str, str]] = set()
+            for _ in range(probes):
+                client = self.manager.next_client(task_type, force_best_model=force_best_model)
+                if client is None:
+                    until = self.manager.seconds_until_key_ready()
+                    wait = until if wait is None else min(wait, until)
+                    break
+                if client in checked:
+                    continue
+                checked.add(client)
+                bucket = self.manager.limiter_for(*client)
+                now = time.monotonic()
+                if bucket.try_acquire(now):
+                    return client
+                until = bucket.seconds_until_available(now)
+                wait = until if wait is None else min(wait, until)
+            logger.info(f"WORKER: No client has quota or is off cooldown. Waiting {wait:.2f}s.")
+            await asyncio.sleep(wait or 0.0)
+
+    async def _pace(self, client: Tuple[str, str]) -> None:
+        """
+        Enforces `delay_between_calls` as a minimum spacing between calls on
+        one (api_key, model) pair. Quota itself is paced by the token buckets.
+
+        The slot is reserved before sleeping (no await in between), so
+        concurrent tasks on the same pair queue up without a lock.
+        """
+        now = time.monotonic()
+        start = max(now, self._next_call_at.get(client, now))
+        self._next_call_at[client] = start + self.delay_between_calls
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def _sleep_with_jitter(self, prev_sleep: float) -> float:
+        """
+        Pauses execution using decorrelated jitter backoff and returns the
+        duration slept, to be passed back in on the next retry.
+
+        Each sleep is drawn uniformly from [base_backoff, 3 * prev_sleep]
+        (capped at max_backoff), so concurrent retries against the same quota
+        drift apart instead of retrying in lockstep.
+        """
+        upper = min(self.max_backoff, (prev_sleep or self.base_backoff) * 3)
+        sleep_for = random.uniform(self.base_backoff, max(self.base_backoff, upper))
+        await asyncio.sleep(sleep_for)
+        return sleep_for
+
+    async def run(self) -> None:
+        """The main loop of a worker task."""
+        logger.info("Gemini API worker task has started.")
+        while True:
+            # Nothing joins this queue, so there is no task_done() bookkeeping
+            job = await self.work_queue.get()
+            if job is None:
+                break  # Shutdown signal
             try:
-                job = self.work_queue.get()
-                if job is None:
-                    break  # Shutdown signal
-
-                original_messages, gen_config, future, loop, retry_count = job
-                
-                force_best = retry_count > 0
-                if force_best:
-                    logger.warning(f"Retry attempt #{retry_count + 1}. Forcing best model.")
-                
-                client_generator = self.manager.get_available_client_details(
-                    TaskType.TEXT_TO_TEXT, 
-                    force_best_model=force_best
+                await self._process_job(job)
+            except Exception as e:
+                logger.critical(f"Critical error in Gemini worker loop: {e}", exc_info=True)
+                future = job[2]
+                if not future.done():
+                    future.set_exception(e)
+        logger.info("Gemini API worker task is shutting down.")
+
+    async def _process_job(self, job: Tuple[Any, Dict[str, Any], asyncio.Future, int]) -> None:
+        """Runs one job through the retry loop and resolves its future."""
+        original_messages, gen_config, future, retry_count = job
+        
+        force_best = retry_count > 0
+        if force_best:
+            logger.warning(f"Retry attempt #{retry_count + 1}. Forcing best model.")
+        
+        contents = _to_contents(original_messages)
+        last_exc: Optional[BaseException] = None
+        prev_sleep = 0.0
+
+        for attempt in range(self.max_attempts):
+            api_key, model_name = await self._acquire_client(force_best)
+            logger.info(f"WORKER: Attempt {attempt + 1}/{self.max_attempts} with key …{api_key[-4:]} on model '{model_name}'")
+            
+            try:
+                model_cfg = self.manager.get_model_config(model_name)
+                if model_cfg:
+                    token_limit = model_cfg.get("tokens", {}).get("output_limit", 8192)
+                    gen_config['max_output_tokens'] = token_limit
+                    logger.info(f"Set max_output_tokens to {token_limit} for {model_name}.")
+
+                await self._pace((api_key, model_name))
+                client = self._client_for(api_key)
+                response = await client.aio.models.generate_content(
+                    model=model_name, 
+                    contents=contents, 
+                    generation_config=types.GenerationConfig(**gen_config),
+                    safety_settings=_SAFETY_SETTINGS
                 )
+                usage = getattr(response, "usage_metadata", None)
+                tokens = getattr(usage, "total_token_count", None) or 0
+                self.manager.record_success(api_key, model_name, tokens)
 
-                contents = _to_contents(original_messages)
-                last_exc: Optional[BaseException] = None
-
-                for attempt in range(self.max_attempts):
-                    api_key, model_name = next(client_generator)
-                    logger.info(f"WORKER: Attempt {attempt + 1}/{self.max_attempts} with key …{api_key[-4:]} on model '{model_name}'")
-                    
-                    try:
-                        model_cfg = self.manager.get_model_config(model_name)
-                        if model_cfg:
-                            token_limit = model_cfg.get("tokens", {}).get("output_limit", 8192)
-                            gen_config['max_output_tokens'] = token_limit
-                            logger.info(f"Set max_output_tokens to {token_limit} for {model_name}.")
-
-                        client = genai.Client(api_key=api_key)
-                        safety_settings = {'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE', 'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE', 'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE', 'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE'}
-                        
-                        response = client.models.generate_content(
-                            model=model_name, 
-                            contents=contents, 
-                            generation_config=types.GenerationConfig(**gen_config),
-                            safety_settings=safety_settings
-                        )
-                        self.manager.mark_key_cooldown(api_key)
+                if not getattr(response, "text", None):
+                    logger.error(f"WORKER: API returned 200 OK but response was empty. Full Response: {response}")
 
-                        if not getattr(response, "text", None):
-                            logger.error(f"WORKER: API returned 200 OK but response was empty. Full Response: {response}")
-
-                        loop.call_soon_threadsafe(future.set_result, (response, model_name))
-                        last_exc = None
-                        break
-                    except Exception as e:
-                        last_exc = e
-                        retryable, status = _is_retryable_exception(e)
-                        if retryable:
-                            logger.warning(f"WORKER: Retryable error (HTTP {status}) with key …{api_key[-4:]}. Retrying.")
-                            self._sleep_with_jitter(attempt)
-                        else:
-                            logger.error(f"WORKER: Non-retryable error: {e}", exc_info=True)
-                            loop.call_soon_threadsafe(future.set_exception, e)
-                            break
-                else:
-                    err = Exception(f"Failed after {self.max_attempts} attempts. Last error: {last_exc}")
-                    logger.error(f"WORKER: Exhausted all retries. Last error: {last_exc}")
-                    loop.call_soon_threadsafe(future.set_exception, err)
+                if not future.done():
+                    future.set_result((response, model_name))
+                return
             except Exception as e:
-                logger.critical(f"Critical error in Gemini worker loop: {e}", exc_info=True)
-                if 'future' in locals() and not future.done():
-                    loop.call_soon_threadsafe(future.set_exception, e)
-            finally:
-                if job:
-                    self.work_queue.task_done()
-                time.sleep(self.delay_between_calls)
-        logger.info("Synchronous Gemini API Worker is shutting down.")
\ No newline at end of file
+                last_exc = e
+                retryable, status = _is_retryable_exception(e)
+                if retryable:
+                    logger.warning(f"WORKER: Retryable error (HTTP {status}) with key …{api_key[-4:]}. Retrying.")
+                    if status == 429:
+                        # The key's real quota is lower than its bucket assumed; bench it.
+                        self.manager.mark_key_cooldown(api_key)
+                    prev_sleep = await self._sleep_with_jitter(prev_sleep)
+                else:
+                    logger.error(f"WORKER: Non-retryable error: {e}", exc_info=True)
+                    if not future.done():
+                        future.set_exception(e)
+                    return
+
+        err = Exception(f"Failed after {self.max_attempts} attempts. Last error: {last_exc}")
+        logger.error(f"WORKER: Exhausted all retries. Last error: {last_exc}")
+        if not future.done():
+            future.set_exception(err)
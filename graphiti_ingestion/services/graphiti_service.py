@@ -45,6 +45,7 @@ class GraphitiService:
             manager=gemini_manager,
             config=LLMConfig(temperature=self.settings.GEMINI_MODEL_TEMPERATURE),
             global_cooldown_seconds=self.settings.GEMINI_GLOBAL_COOLDOWN_SECONDS,
+            worker_concurrency=self.settings.GEMINI_WORKER_CONCURRENCY,
         )
 
         logger.info("Initializing ManagedGeminiReranker...")
@@ -86,10 +87,10 @@ class GraphitiService:
         if self.jina_embedder:
             await self.jina_embedder.close()
         if self.managed_llm_client:
-            self.managed_llm_client.close()
+            await self.managed_llm_client.close()
             logger.info("ManagedGeminiClient worker has been closed.")
         if self.managed_reranker:
-            self.managed_reranker.close()
+            await self.managed_reranker.close()
             logger.info("ManagedGeminiReranker worker has been closed.")
         logger.info("All services and connections are now closed.")
 
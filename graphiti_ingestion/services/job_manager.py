@@ -6,7 +6,9 @@ import logging
 import os
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import orjson
 
 from ..api.dashboard_websockets import websocket_manager
 from ..config import get_settings
@@ -59,7 +61,7 @@ class JobManager:
     def _broadcast_job_update(self, job_data: Dict[str, Any]) -> None:
         """Helper to send a real-time job update to all dashboard clients."""
         message = {"type": "job_update", "payload": job_data}
-        websocket_manager.broadcast_threadsafe(json.dumps(message))
+        websocket_manager.broadcast_threadsafe(orjson.dumps(message))
         logger.debug(f"Broadcasted job update for {job_data.get('job_id')}")
 
     async def submit_job(self, job_id: str, data: Dict[str, Any]) -> None:
@@ -92,9 +94,13 @@ class JobManager:
                 return json.loads(content)
         return None
 
-    async def get_all_job_statuses(self) -> List[Dict[str, Any]]:
-        """Scans all directories for the dashboard's initial data load."""
-        all_jobs = []
+    async def iter_job_statuses(self, chunk_size: int = 256) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Scans all directories and yields job statuses in chunks of up to
+        `chunk_size`, so callers can stream them instead of waiting for the
+        whole scan. Chunks are in directory order, not sorted.
+        """
+        chunk: List[Dict[str, Any]] = []
         loop = asyncio.get_running_loop()
 
         for path in self.paths.values():
@@ -106,12 +112,15 @@ class JobManager:
                         submitted = datetime.fromisoformat(job_data["submitted_at"])
                         completed = datetime.fromisoformat(job_data["last_updated"])
                         job_data["processing_time_seconds"] = round((completed - submitted).total_seconds(), 2)
-                    all_jobs.append(job_data)
+                    chunk.append(job_data)
                 except Exception as e:
                     logger.error(f"Could not parse status file {status_file}: {e}")
-
-        all_jobs.sort(key=lambda j: j.get("submitted_at", ""), reverse=True)
-        return all_jobs
+                    continue
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
 
     async def get_next_job(self) -> Optional[Tuple[str, Dict[str, Any], int]]:
         """
@@ -47,6 +47,8 @@ async def worker(job_manager: JobManager, graphiti_service: GraphitiService):
     The main background worker, now with intelligent failure recovery.
     """
     logger.info("Background worker with advanced failure recovery started.")
+    # Settings are frozen, so read the per-job values once up front
+    post_success_delay = settings.POST_SUCCESS_DELAY_SECONDS
     while True:
         try:
             job_details = await job_manager.get_next_job()
@@ -61,7 +63,7 @@ async def worker(job_manager: JobManager, graphiti_service: GraphitiService):
                     )
                     logger.info(f"Worker successfully completed job {job_id}.")
                     
-                    delay = settings.POST_SUCCESS_DELAY_SECONDS
+                    delay = post_success_delay
                     if delay > 0:
                         logger.info(f"Success cooldown: Waiting for {delay} seconds before next job.")
                         await asyncio.sleep(delay)
@@ -27,6 +27,8 @@ document.addEventListener('DOMContentLoaded', () => {
     // Store all job data in memory for quick access and real-time updates
     let allJobsData = {};
     let socket;
+    // Broadcasts arrive as binary frames holding UTF-8 encoded JSON
+    const textDecoder = new TextDecoder('utf-8');
 
     // --- WebSocket Connection Handling ---
     function connectWebSocket() {
@@ -35,6 +37,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
         console.log(`Attempting to connect to WebSocket at: ${wsUrl}`);
         socket = new WebSocket(wsUrl);
+        socket.binaryType = 'arraybuffer';
 
         socket.onopen = () => {
             console.log('WebSocket connection established.');
@@ -44,7 +47,8 @@ document.addEventListener('DOMContentLoaded', () => {
         };
 
         socket.onmessage = (event) => {
-            const data = JSON.parse(event.data);
+            const raw = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data);
+            const data = JSON.parse(raw);
             handleWebSocketMessage(data);
         };
 
@@ -74,16 +78,22 @@ document.addEventListener('DOMContentLoaded', () => {
     // --- WebSocket Message Processing ---
     function handleWebSocketMessage(data) {
         switch (data.type) {
-            case 'log':
-                appendLogLine(data.payload);
+            case 'logs':
+                // Log lines are batched server-side into one frame
+                data.payload.forEach(appendLogLine);
                 break;
-            case 'all_jobs':
-                // Received the initial snapshot of all jobs
-                allJobsData = {}; // Clear existing data
+            case 'all_jobs_chunk':
+                // The initial snapshot of all jobs arrives in chunks;
+                // seq 0 starts a fresh snapshot and `done` marks the last one.
+                if (data.seq === 0) {
+                    allJobsData = {}; // Clear existing data
+                }
                 data.payload.forEach(job => {
                     allJobsData[job.job_id] = job;
                 });
-                renderAllJobs();
+                if (data.done) {
+                    renderAllJobs();
+                }
                 break;
             
             // ---> THIS IS THE NEW, REAL-TIME LOGIC <---
@@ -143,7 +153,7 @@ document.addEventListener('DOMContentLoaded', () => {
         const submittedTime = new Date(job.submitted_at).toLocaleString();
 
         card.innerHTML = `
-            <div class="job-id">${job.job_id.split('-')[0]}...</div>
+            <div class="job-id">${job.job_id.slice(0, 8)}...</div>
             <div class="job-description">${descriptionText}...</div>
             <div class="job-timestamp">Submitted: ${submittedTime}</div>
         `;